@@ -1,283 +1,427 @@
-import os
-from datetime import datetime, timedelta
-from typing import List
-
-from fastapi import FastAPI, HTTPException, Depends, Body
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session, joinedload
-from dotenv import load_dotenv
-from jose import jwt, JWTError
-from passlib.context import CryptContext
-
-from database import Base, get_db
-from models import Account, Student, Exam, Result
-from schemas import StudentCreate, StudentOut, ExamCreate, ExamOut, ResultCreate, ResultOut
-from routes.auth import router as auth_router
-
-# ---------------- ENV ----------------
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not found in .env")
-
-SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey123")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
-
-# ---------------- DB ----------------
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base.metadata.create_all(bind=engine)
-
-# ---------------- APP ----------------
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-security = HTTPBearer()
-app = FastAPI(title="Online Exam Management API")
-app.include_router(auth_router)
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-@app.get("/")
-def root():
-    return FileResponse("static/index.html")
-
-# ---------------- JWT HELPERS ----------------
-def create_access_token(data: dict, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=expires_minutes)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-def get_current_account(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> Account:
-    token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    account = db.query(Account).filter(Account.id == user_id).first()
-    if not account:
-        raise HTTPException(status_code=401, detail="Account not found")
-    return account
-
-# ---------------- DEPENDENCY ----------------
-def get_db_session():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# ---------------- SEED ADMIN ----------------
-@app.on_event("startup")
-def seed_admin():
-    db = SessionLocal()
-    admin_contact = os.getenv("ADMIN_CONTACT", "admin@example.com")
-    admin_name = os.getenv("ADMIN_NAME", "Administrator")
-    admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
-    if not db.query(Account).filter(Account.contact == admin_contact).first():
-        account = Account(
-            contact=admin_contact,
-            fullname=admin_name,
-            password_hash=pwd_context.hash(admin_password),
-            role="admin"
-        )
-        db.add(account)
-        db.commit()
-        print(f"Seeded admin: {admin_contact} / {admin_password}")
-    db.close()
-
-# ---------------- STUDENTS ----------------
-@app.get("/students", response_model=List[StudentOut])
-def get_students(current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    if current_user.role == "student":
-        student = db.query(Student).filter(Student.account_id == current_user.id).first()
-        return [student] if student else []
-    # Admin and teacher can see all students
-    return db.query(Student).all()
-
-@app.post("/students", response_model=StudentOut)
-def add_student(student: StudentCreate, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(status_code=403, detail="No permission")
-    account = db.query(Account).filter(Account.contact == student.email).first()
-    if not account:
-        raise HTTPException(status_code=400, detail=f"No account found for {student.email}. Please create the account first.")
-    new_student = Student(
-        student_number=student.student_number,
-        name=student.name,
-        email=student.email,
-        age=student.age,
-        grade=student.grade,
-        created_at=datetime.utcnow(),
-        account_id=account.id
-    )
-    db.add(new_student)
-    db.commit()
-    db.refresh(new_student)
-    return new_student
-
-@app.put("/students/{student_id}", response_model=StudentOut)
-def update_student(student_id: int, student: StudentCreate, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    s = db.query(Student).filter(Student.id == student_id).first()
-    if not s:
-        raise HTTPException(404, "Student not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    for k, v in student.dict().items():
-        setattr(s, k, v)
-    db.commit()
-    db.refresh(s)
-    return s
-
-@app.delete("/students/{student_id}")
-def delete_student(student_id: int, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    s = db.query(Student).filter(Student.id == student_id).first()
-    if not s:
-        raise HTTPException(404, "Student not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    db.delete(s)
-    db.commit()
-    return {"message": "Student deleted"}
-
-# ---------------- EXAMS ----------------
-@app.get("/exams", response_model=List[ExamOut])
-def get_exams(current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    return db.query(Exam).all()
-
-@app.post("/exams", response_model=ExamOut)
-def add_exam(exam: ExamCreate, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    new_exam = Exam(**exam.dict())
-    db.add(new_exam)
-    db.commit()
-    db.refresh(new_exam)
-    return new_exam
-
-@app.put("/exams/{exam_id}", response_model=ExamOut)
-def update_exam(exam_id: int, exam: ExamCreate, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    e = db.query(Exam).filter(Exam.id == exam_id).first()
-    if not e:
-        raise HTTPException(404, "Exam not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    for k, v in exam.dict().items():
-        setattr(e, k, v)
-    db.commit()
-    db.refresh(e)
-    return e
-
-@app.delete("/exams/{exam_id}")
-def delete_exam(exam_id: int, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    e = db.query(Exam).filter(Exam.id == exam_id).first()
-    if not e:
-        raise HTTPException(404, "Exam not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    db.delete(e)
-    db.commit()
-    return {"message": "Exam deleted"}
-
-# ---------------- RESULTS ----------------
-@app.get("/results", response_model=List[ResultOut])
-def get_results(current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    # Start with base query for Results, with student and exam relationships loaded
-    query = db.query(Result).options(joinedload(Result.student), joinedload(Result.exam))
-    
-    # If current user is a student, only fetch their results
-    if current_user.role == "student":
-        student = db.query(Student).filter(Student.account_id == current_user.id).first()
-        if not student:
-            return []  # No student record found for this account
-        query = query.filter(Result.student_id == student.id)
-    
-    # Execute query
-    results = query.all()
-    
-    # Transform results into the Pydantic schema
-    return [
-        ResultOut(
-            id=r.id,
-            student_id=r.student_id,
-            student_name=r.student.name if r.student else "Unknown",
-            exam_id=r.exam_id,
-            exam_title=r.exam.title if r.exam else "Unknown",
-            score=r.score
-        )
-        for r in results
-    ]
-
-
-@app.post("/results", response_model=ResultOut)
-def add_result(result: ResultCreate = Body(...), current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    student = db.query(Student).filter(Student.id == result.student_id).first()
-    if not student:
-        raise HTTPException(404, "Student not found")
-    exam = db.query(Exam).filter(Exam.id == result.exam_id).first()
-    if not exam:
-        raise HTTPException(404, "Exam not found")
-    new_result = Result(
-        student_id=student.id,
-        exam_id=exam.id,
-        score=result.score,
-        taken_at=datetime.utcnow()
-    )
-    db.add(new_result)
-    db.commit()
-    db.refresh(new_result)
-    return ResultOut(
-        id=new_result.id,
-        student_id=new_result.student_id,
-        student_name=new_result.student.name,
-        exam_id=new_result.exam_id,
-        exam_title=new_result.exam.title,
-        score=new_result.score
-    )
-
-@app.put("/results/{result_id}", response_model=ResultOut)
-def update_result(result_id: int, result: ResultCreate = Body(...), current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    r = db.query(Result).filter(Result.id == result_id).first()
-    if not r:
-        raise HTTPException(404, "Result not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    student = db.query(Student).filter(Student.id == result.student_id).first()
-    if not student:
-        raise HTTPException(404, "Student not found")
-    exam = db.query(Exam).filter(Exam.id == result.exam_id).first()
-    if not exam:
-        raise HTTPException(404, "Exam not found")
-    r.student_id = student.id
-    r.exam_id = exam.id
-    r.score = result.score
-    db.commit()
-    db.refresh(r)
-    db.refresh(r.student)
-    db.refresh(r.exam)
-    return ResultOut(
-        id=r.id,
-        student_id=r.student_id,
-        student_name=r.student.name,
-        exam_id=r.exam_id,
-        exam_title=r.exam.title,
-        score=r.score
-    )
-
-@app.delete("/results/{result_id}")
-def delete_result(result_id: int, current_user: Account = Depends(get_current_account), db: Session = Depends(get_db_session)):
-    r = db.query(Result).filter(Result.id == result_id).first()
-    if not r:
-        raise HTTPException(404, "Result not found")
-    if current_user.role not in ["admin", "teacher"]:
-        raise HTTPException(403, "No permission")
-    db.delete(r)
-    db.commit()
-    return {"message": "Result deleted"}
+import hashlib
+import os
+import threading
+from datetime import datetime
+from typing import List
+
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Depends, Body, Request, Response
+from fastapi.staticfiles import StaticFiles
+import orjson
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import create_engine, select, func, insert, update, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session, raiseload
+from dotenv import load_dotenv
+
+from auth_utils import get_current_account, hash_password
+from database import Base
+from models import Account, Student, Exam, Result
+from schemas import StudentCreate, StudentOut, ExamCreate, ExamOut, ResultCreate, ResultOut
+from routes.auth import router as auth_router
+
+# ---------------- ENV ----------------
+load_dotenv()
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL not found in .env")
+
+# When enabled (dev/test), any relationship access not covered by an explicit
+# eager load raises instead of silently issuing an N+1 lazy query.
+RAISELOAD_ENABLED = os.getenv("RAISELOAD_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# ---------------- DB ----------------
+# pool_recycle keeps connections younger than typical idle-kill windows so
+# pre_ping rarely has to re-establish them
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+)
+# expire_on_commit=False keeps returned objects readable after commit;
+# otherwise response serialization would re-SELECT every attribute, undoing
+# the RETURNING-based removal of the explicit refreshes
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+Base.metadata.create_all(bind=engine)
+
+# Async engine for the read-heavy list endpoints: DB I/O interleaves on the
+# event loop instead of occupying threadpool workers
+async_engine = create_async_engine(
+    # make_url handles every accepted URL spelling (postgres://,
+    # postgresql+psycopg2://, ...), unlike a prefix string replace
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=40,
+    pool_recycle=1800,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+# ---------------- APP ----------------
+app = FastAPI(title="Online Exam Management API", default_response_class=ORJSONResponse)
+app.include_router(auth_router)
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+@app.get("/")
+def root():
+    return FileResponse("static/index.html")
+
+# ---------------- AUTH ----------------
+# Token creation, decoding (with the TTL cache), and the account lookup all
+# live in auth_utils now; this module only layers the role check on top.
+_WRITE_ROLES = frozenset({"admin", "teacher"})
+
+def require_write(current_user: Account = Depends(get_current_account)) -> Account:
+    """Dependency for routes only admins and teachers may call."""
+    if current_user.role not in _WRITE_ROLES:
+        raise HTTPException(status_code=403, detail="No permission")
+    return current_user
+
+def _raiseload_opts():
+    return (raiseload("*"),) if RAISELOAD_ENABLED else ()
+
+# ---------------- LIST CACHE ----------------
+# Short-TTL response cache for the low-cardinality list endpoints, same
+# pattern as the token cache above. Entries are keyed by the ETag signature,
+# so a write from any process rotates the key and forces a miss; the TTL just
+# bounds how long dead entries linger. Write routes also invalidate by prefix.
+_list_cache = TTLCache(maxsize=64, ttl=30)
+_list_cache_lock = threading.Lock()
+
+def _list_cache_get(key: str):
+    with _list_cache_lock:
+        return _list_cache.get(key)
+
+def _list_cache_set(key: str, value):
+    with _list_cache_lock:
+        _list_cache[key] = value
+
+def _list_cache_invalidate(prefix: str):
+    with _list_cache_lock:
+        for key in [k for k in _list_cache if k.startswith(prefix)]:
+            del _list_cache[key]
+
+# ---------------- ETAG ----------------
+async def _list_etag(db: AsyncSession, model, scope: str = "") -> str:
+    """
+    Cheap list signature: row count + latest updated_at. Any insert, update,
+    or delete changes it, so a matching If-None-Match can safely 304.
+    """
+    count, latest = (await db.execute(select(func.count(), func.max(model.updated_at)).select_from(model))).one()
+    sig = f"{model.__tablename__}:{scope}:{count}:{latest}"
+    return '"' + hashlib.blake2b(sig.encode(), digest_size=16).hexdigest() + '"'
+
+# ---------------- DEPENDENCY ----------------
+def get_db_session():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# ---------------- SCHEMA UPGRADES ----------------
+# create_all only creates missing tables - it never alters existing ones, so
+# columns and indexes added after the first deploy need explicit DDL or the
+# list endpoints would 500 on max(updated_at) against an older database.
+# Student.account_id needs no index here: its UNIQUE constraint already has one.
+_SCHEMA_DDL = (
+    "ALTER TABLE studentspelec ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+    "ALTER TABLE exams ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+    "ALTER TABLE results ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+    "CREATE INDEX IF NOT EXISTS ix_results_student_id ON results (student_id)",
+    "CREATE INDEX IF NOT EXISTS ix_results_exam_id ON results (exam_id)",
+    "CREATE INDEX IF NOT EXISTS ix_results_student_exam ON results (student_id, exam_id) INCLUDE (score)",
+)
+
+@app.on_event("startup")
+def apply_schema_upgrades():
+    with engine.connect() as conn:
+        for ddl in _SCHEMA_DDL:
+            try:
+                conn.execute(text(ddl))
+                conn.commit()
+            except Exception:
+                conn.rollback()  # unsupported syntax outside Postgres (e.g. SQLite)
+
+# ---------------- SEED ADMIN ----------------
+_seed_done = False
+
+@app.on_event("startup")
+def seed_admin():
+    global _seed_done
+    if _seed_done:
+        return
+    db = SessionLocal()
+    admin_contact = os.getenv("ADMIN_CONTACT", "admin@example.com")
+    admin_name = os.getenv("ADMIN_NAME", "Administrator")
+    admin_password = os.getenv("ADMIN_PASSWORD", "admin123")
+    # Serialize the check across workers so a fleet restart can't double-seed;
+    # the lock is released when this transaction ends
+    try:
+        db.execute(text("SELECT pg_advisory_xact_lock(4242)"))
+    except Exception:
+        db.rollback()  # no advisory locks outside Postgres (e.g. SQLite)
+    if not db.query(Account.id).filter(Account.contact == admin_contact).first():
+        account = Account(
+            contact=admin_contact,
+            fullname=admin_name,
+            password_hash=hash_password(admin_password),
+            role="admin"
+        )
+        db.add(account)
+        db.commit()
+        print(f"Seeded admin: {admin_contact} / {admin_password}")
+    db.close()
+    _seed_done = True
+
+# ---------------- STUDENTS ----------------
+# Columns the list endpoints actually serve; the Core projection below skips
+# ORM hydration and the response-model re-validation entirely
+_STUDENT_COLS = (Student.id, Student.student_number, Student.name, Student.email, Student.age, Student.grade, Student.account_id)
+
+def _student_dict(s: Student) -> dict:
+    return {"id": s.id, "student_number": s.student_number, "name": s.name,
+            "email": s.email, "age": s.age, "grade": s.grade, "account_id": s.account_id}
+
+@app.get("/students", response_model=None)
+async def get_students(request: Request, current_user: Account = Depends(get_current_account), db: AsyncSession = Depends(get_async_db)):
+    etag = await _list_etag(db, Student, scope=str(current_user.id) if current_user.role == "student" else "all")
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    if current_user.role == "student":
+        # Student was eager-loaded with the Account in get_current_account
+        data = [_student_dict(current_user.student)] if current_user.student else []
+        return ORJSONResponse(data, headers={"ETag": etag})
+    # Admin and teacher can see all students
+    cache_key = f"students:all:{etag}"
+    students = _list_cache_get(cache_key)
+    if students is None:
+        rows = (await db.execute(select(*_STUDENT_COLS))).mappings().all()
+        students = [dict(r) for r in rows]
+        _list_cache_set(cache_key, students)
+    return ORJSONResponse(students, headers={"ETag": etag})
+
+@app.post("/students", response_model=StudentOut)
+def add_student(student: StudentCreate, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    account = db.query(Account).filter(Account.contact == student.email).first()
+    if not account:
+        raise HTTPException(status_code=400, detail=f"No account found for {student.email}. Please create the account first.")
+    # INSERT ... RETURNING hands back the full row in one round-trip,
+    # replacing the add/commit/refresh pattern and its extra SELECT
+    stmt = (
+        insert(Student)
+        .values(**student.model_dump(), created_at=datetime.utcnow(), account_id=account.id)
+        .returning(Student)
+    )
+    new_student = db.execute(stmt).scalar_one()
+    db.commit()
+    _list_cache_invalidate("students")
+    return new_student
+
+@app.put("/students/{student_id}", response_model=StudentOut)
+def update_student(student_id: int, student: StudentCreate, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    # exclude_unset: only fields the client actually sent are written
+    values = student.model_dump(exclude_unset=True)
+    if not values:
+        s = db.get(Student, student_id)
+        if not s:
+            raise HTTPException(404, "Student not found")
+        return s
+    stmt = update(Student).where(Student.id == student_id).values(**values).returning(Student)
+    s = db.execute(stmt).scalar_one_or_none()
+    if not s:
+        raise HTTPException(404, "Student not found")
+    db.commit()
+    _list_cache_invalidate("students")
+    return s
+
+@app.delete("/students/{student_id}")
+def delete_student(student_id: int, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    s = db.query(Student).options(*_raiseload_opts()).filter(Student.id == student_id).first()
+    if not s:
+        raise HTTPException(404, "Student not found")
+    db.delete(s)
+    db.commit()
+    _list_cache_invalidate("students")
+    return {"message": "Student deleted"}
+
+# ---------------- EXAMS ----------------
+@app.get("/exams", response_model=None)
+async def get_exams(request: Request, current_user: Account = Depends(get_current_account), db: AsyncSession = Depends(get_async_db)):
+    etag = await _list_etag(db, Exam)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    cache_key = f"exams:all:{etag}"
+    exams = _list_cache_get(cache_key)
+    if exams is None:
+        rows = (await db.execute(select(Exam.id, Exam.title, Exam.total_marks))).mappings().all()
+        exams = [dict(r) for r in rows]
+        _list_cache_set(cache_key, exams)
+    return ORJSONResponse(exams, headers={"ETag": etag})
+
+@app.post("/exams", response_model=ExamOut)
+def add_exam(exam: ExamCreate, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    new_exam = db.execute(insert(Exam).values(**exam.model_dump()).returning(Exam)).scalar_one()
+    db.commit()
+    _list_cache_invalidate("exams")
+    return new_exam
+
+@app.put("/exams/{exam_id}", response_model=ExamOut)
+def update_exam(exam_id: int, exam: ExamCreate, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    values = exam.model_dump(exclude_unset=True)
+    if not values:
+        e = db.get(Exam, exam_id)
+        if not e:
+            raise HTTPException(404, "Exam not found")
+        return e
+    stmt = update(Exam).where(Exam.id == exam_id).values(**values).returning(Exam)
+    e = db.execute(stmt).scalar_one_or_none()
+    if not e:
+        raise HTTPException(404, "Exam not found")
+    db.commit()
+    _list_cache_invalidate("exams")
+    return e
+
+@app.delete("/exams/{exam_id}")
+def delete_exam(exam_id: int, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    e = db.query(Exam).options(*_raiseload_opts()).filter(Exam.id == exam_id).first()
+    if not e:
+        raise HTTPException(404, "Exam not found")
+    db.delete(e)
+    db.commit()
+    _list_cache_invalidate("exams")
+    return {"message": "Exam deleted"}
+
+# ---------------- RESULTS ----------------
+@app.get("/results", response_model=None)
+async def get_results(request: Request, current_user: Account = Depends(get_current_account), db: AsyncSession = Depends(get_async_db)):
+    etag = await _list_etag(db, Result, scope=str(current_user.id) if current_user.role == "student" else "all")
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # Project exactly the columns ResultOut needs - no ORM instances, no
+    # hydration of full Result/Student/Exam rows
+    stmt = (
+        select(
+            Result.id,
+            Result.student_id,
+            func.coalesce(Student.name, "Unknown").label("student_name"),
+            Result.exam_id,
+            func.coalesce(Exam.title, "Unknown").label("exam_title"),
+            Result.score,
+        )
+        .outerjoin(Student, Result.student_id == Student.id)
+        .outerjoin(Exam, Result.exam_id == Exam.id)
+        .execution_options(yield_per=500)
+    )
+
+    # If current user is a student, only fetch their results
+    if current_user.role == "student":
+        stmt = stmt.where(Student.account_id == current_user.id)
+
+    # Stream rows straight from the server-side cursor as one JSON array;
+    # memory stays flat no matter how many results an admin has
+    result = await db.stream(stmt)
+
+    async def gen():
+        yield b"["
+        first = True
+        async for row in result:
+            if not first:
+                yield b","
+            first = False
+            yield orjson.dumps(dict(row._mapping))
+        yield b"]"
+
+    return StreamingResponse(gen(), media_type="application/json", headers={"ETag": etag})
+
+
+@app.post("/results", response_model=ResultOut)
+def add_result(result: ResultCreate = Body(...), current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    # db.get hits the identity map first, so already-loaded rows cost no query
+    student = db.get(Student, result.student_id)
+    if not student:
+        raise HTTPException(404, "Student not found")
+    exam = db.get(Exam, result.exam_id)
+    if not exam:
+        raise HTTPException(404, "Exam not found")
+    stmt = (
+        insert(Result)
+        .values(student_id=student.id, exam_id=exam.id, score=result.score, taken_at=datetime.utcnow())
+        .returning(Result)
+    )
+    new_result = db.execute(stmt).scalar_one()
+    db.commit()
+    # Values just came from the DB; construct without re-validating
+    return ResultOut.model_construct(
+        id=new_result.id,
+        student_id=new_result.student_id,
+        student_name=student.name,
+        exam_id=new_result.exam_id,
+        exam_title=exam.title,
+        score=new_result.score
+    )
+
+@app.post("/results/bulk")
+def add_results_bulk(results: List[ResultCreate], current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    """Insert a batch of results in one executemany round-trip."""
+    if not results:
+        return {"inserted": 0}
+    # Validate all referenced ids with two IN queries instead of 2N lookups
+    student_ids = {r.student_id for r in results}
+    exam_ids = {r.exam_id for r in results}
+    found_students = set(db.execute(select(Student.id).where(Student.id.in_(student_ids))).scalars())
+    if student_ids - found_students:
+        raise HTTPException(404, f"Students not found: {sorted(student_ids - found_students)}")
+    found_exams = set(db.execute(select(Exam.id).where(Exam.id.in_(exam_ids))).scalars())
+    if exam_ids - found_exams:
+        raise HTTPException(404, f"Exams not found: {sorted(exam_ids - found_exams)}")
+    now = datetime.utcnow()
+    db.execute(insert(Result), [{**r.model_dump(), "taken_at": now} for r in results])
+    db.commit()
+    return {"inserted": len(results)}
+
+@app.put("/results/{result_id}", response_model=ResultOut)
+def update_result(result_id: int, result: ResultCreate = Body(...), current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    student = db.get(Student, result.student_id)
+    if not student:
+        raise HTTPException(404, "Student not found")
+    exam = db.get(Exam, result.exam_id)
+    if not exam:
+        raise HTTPException(404, "Exam not found")
+    stmt = (
+        update(Result)
+        .where(Result.id == result_id)
+        .values(student_id=student.id, exam_id=exam.id, score=result.score)
+        .returning(Result)
+    )
+    r = db.execute(stmt).scalar_one_or_none()
+    if not r:
+        raise HTTPException(404, "Result not found")
+    db.commit()
+    # With expire_on_commit=False the student/exam attributes read below stay
+    # loaded across the commit, so no refresh (and no extra SELECT) is needed
+    # Values just came from the DB; construct without re-validating
+    return ResultOut.model_construct(
+        id=r.id,
+        student_id=r.student_id,
+        student_name=student.name,
+        exam_id=r.exam_id,
+        exam_title=exam.title,
+        score=r.score
+    )
+
+@app.delete("/results/{result_id}")
+def delete_result(result_id: int, current_user: Account = Depends(require_write), db: Session = Depends(get_db_session)):
+    r = db.query(Result).options(*_raiseload_opts()).filter(Result.id == result_id).first()
+    if not r:
+        raise HTTPException(404, "Result not found")
+    db.delete(r)
+    db.commit()
+    return {"message": "Result deleted"}
@@ -1,12 +1,16 @@
 # auth_utils.py
+import hashlib
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from passlib.context import CryptContext
 
 from database import get_db
@@ -29,11 +33,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 # ---------------- JWT TOKEN ----------------
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Decoded payloads cached briefly so polling clients don't pay HMAC + JSON
+# parsing on every request. Keyed by a hash of the token, never the token itself.
+_decoded_tokens = TTLCache(maxsize=10_000, ttl=30)
+_decoded_lock = threading.Lock()
+
+def decode_token(token: str) -> dict:
+    """
+    Decode a JWT, caching the payload for repeat calls with the same token.
+    Expiry is still checked on every call, cached or not.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _decoded_lock:
+        payload = _decoded_tokens.get(key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with _decoded_lock:
+            _decoded_tokens[key] = payload
+    if payload.get("exp", 0) <= time.time():
+        raise JWTError("Token expired")
+    return payload
+
 def create_access_token(user_id: int, contact: str, role: str, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT token including user_id, contact, and role.
     """
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode = {
         "sub": contact,
         "user_id": user_id,
@@ -51,7 +76,7 @@ def get_current_account(
     Raises 401 if invalid.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         contact: str = payload.get("sub")
         user_id: int = payload.get("user_id")
         role: str = payload.get("role")
@@ -60,7 +85,12 @@ def get_current_account(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    account = db.query(Account).filter(Account.id == user_id, Account.contact == contact).first()
+    account = (
+        db.query(Account)
+        .options(selectinload(Account.student))
+        .filter(Account.id == user_id, Account.contact == contact)
+        .first()
+    )
     if not account:
         raise HTTPException(status_code=401, detail="Account not found")
     
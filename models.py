@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -11,7 +11,8 @@ class Account(Base):
     password_hash = Column(String(200), nullable=False)
     role = Column(String(20), default="student")
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
-    student = relationship("Student", back_populates="account", uselist=False)
+    # selectin (not joined) so the eager load doesn't duplicate Account rows
+    student = relationship("Student", back_populates="account", uselist=False, lazy="selectin")
 
 class Student(Base):
     __tablename__ = "studentspelec"
@@ -22,6 +23,8 @@ class Student(Base):
     age = Column(Integer, nullable=True)
     grade = Column(Float, nullable=True)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # no index=True: the UNIQUE constraint's implicit index already covers lookups
     account_id = Column(Integer, ForeignKey("accounts.id"), unique=True, nullable=True)
     account = relationship("Account", back_populates="student")
 
@@ -31,13 +34,19 @@ class Exam(Base):
     title = Column(String(150), nullable=False)
     total_marks = Column(Integer, nullable=False)
     created_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Result(Base):
     __tablename__ = "results"
+    # Covering index so per-student result fetches are index-only on Postgres
+    __table_args__ = (
+        Index("ix_results_student_exam", "student_id", "exam_id", postgresql_include=["score"]),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    student_id = Column(Integer, ForeignKey("studentspelec.id"))
-    exam_id = Column(Integer, ForeignKey("exams.id"))
+    student_id = Column(Integer, ForeignKey("studentspelec.id"), index=True)
+    exam_id = Column(Integer, ForeignKey("exams.id"), index=True)
     score = Column(Float, nullable=False)
     taken_at = Column(TIMESTAMP, default=datetime.utcnow)
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
     student = relationship("Student")
     exam = relationship("Exam")
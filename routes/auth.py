@@ -1,68 +1,52 @@
 # auth.py
-import os
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from jose import jwt
 
+from auth_utils import create_access_token, hash_password, verify_password
 from database import get_db
 from models import Account, Student
 from schemas import UserRegister, UserLogin, Token
 
-# ---------------- SETTINGS ----------------
-SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey123")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
-
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
-# ---------------- HELPERS ----------------
-def hash_password(password: str) -> str:
-    if not password or len(password) < 6:
-        raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
 # ---------------- ROUTES ----------------
 @router.post("/register", response_model=Token)
-def register(data: UserRegister, db: Session = Depends(get_db)):
+async def register(data: UserRegister, db: Session = Depends(get_db)):
     """
     Self-registration: students or teachers can register.
     Admin role is NOT allowed here.
+    Argon2 hashing runs in the threadpool so it doesn't block the event loop.
     """
     # Validate role
     try:
         data.validate_role()
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
+    if not data.password or len(data.password) < 6:
+        raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
+
     # Check if contact/email already exists
-    if db.query(Account).filter(Account.contact == data.contact).first():
+    existing = await run_in_threadpool(
+        lambda: db.query(Account).filter(Account.contact == data.contact).first()
+    )
+    if existing:
         raise HTTPException(status_code=400, detail="Contact already registered")
 
-    # Create account
+    # Create account (Argon2 takes ~50-200 ms, keep it off the event loop)
+    password_hash = await run_in_threadpool(hash_password, data.password)
     account = Account(
         contact=data.contact,
         fullname=data.fullname.strip(),
-        password_hash=hash_password(data.password),
+        password_hash=password_hash,
         role=data.role,  # now uses the role from input
         created_at=datetime.utcnow()
     )
     db.add(account)
-    db.commit()
-    db.refresh(account)
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, account)
 
     # If role is student, create linked Student record
     if data.role == "student":
@@ -74,14 +58,10 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
             account_id=account.id
         )
         db.add(student)
-        db.commit()
+        await run_in_threadpool(db.commit)
 
     # Generate JWT for immediate login
-    token = create_access_token({
-        "sub": account.contact,
-        "user_id": account.id,
-        "role": account.role
-    })
+    token = create_access_token(account.id, account.contact, account.role)
 
     return {
         "access_token": token,
@@ -92,20 +72,18 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(data: UserLogin, db: Session = Depends(get_db)):
-    """Login with contact and password."""
+async def login(data: UserLogin, db: Session = Depends(get_db)):
+    """Login with contact and password. Argon2 verify runs in the threadpool."""
     if not data.contact or not data.password:
         raise HTTPException(status_code=400, detail="Contact and password are required")
 
-    account = db.query(Account).filter(Account.contact == data.contact).first()
-    if not account or not verify_password(data.password, account.password_hash):
+    account = await run_in_threadpool(
+        lambda: db.query(Account).filter(Account.contact == data.contact).first()
+    )
+    if not account or not await run_in_threadpool(verify_password, data.password, account.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token({
-        "sub": account.contact,
-        "user_id": account.id,
-        "role": account.role
-    })
+    token = create_access_token(account.id, account.contact, account.role)
 
     return {
         "access_token": token,